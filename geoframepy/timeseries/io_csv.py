@@ -64,9 +64,9 @@ def pandas_read_OMS_timeseries(file_name, **kwargs):
     datetime_index = kwargs.get('datetime_index',True)
     parse_dates = kwargs.get('parse_dates',True)
     
-    df = pd.read_csv(file_name,skiprows=3,header=1,low_memory=False)
-    df = df.drop(['ID'],axis=1)
-    df = df.drop([0,1],axis=0)
+    # the header is the ID row: the OMS metadata rows are skipped while parsing
+    # so that the values are read as numbers and not as strings
+    df = pd.read_csv(file_name,skiprows=[0,1,2,3,5,6],header=0,usecols=lambda column: column != 'ID',low_memory=False)
     df.columns.values[0] = 'Datetime'
     if(parse_dates==True):
         try:
@@ -121,41 +121,32 @@ def write_OMS_timeseries(df, file_name, **kwargs):
     frequency = kwargs.get('frequency','1H')
 
     if has_datetime==True:
-        df.reset_index(inplace=True)
+        df = df.reset_index()
         df[df.columns[0]] = pd.to_datetime(df[df.columns[0]]).dt.strftime('%Y-%m-%d %H:%M')
-        df = df.astype(str)
     else:
-        df = df.astype(str)
         date_rng = pd.period_range(start=start_date, periods=df.shape[0], freq=frequency).strftime('%Y-%m-%d %H:%M')
         df_dates = pd.DataFrame(date_rng, columns=['date'])
         df = pd.concat([df_dates, df],sort=False, axis=1)
     
-    df.replace('nan','-9999',inplace = True)
-    df.replace('-9999.0','-9999',inplace = True)
+    # the values are formatted by to_csv: missing values and -9999.0 are
+    # both written as -9999 through na_rep
+    float_columns = df.select_dtypes(include='floating').columns
+    df[float_columns] = df[float_columns].mask(df[float_columns] == -9999)
     
-    n_col = df.shape[1]
-    value = []
-    ID = []
-    double = []
-    commas = []
-    for i in range(1,n_col):
-        value.append(',value_'+str(df.columns[i]))
-        ID.append(','+str(df.columns[i]))
-        double.append(',double')
-        commas.append(',')
+    ID = [str(column) for column in df.columns[1:]]
+    n_ID = len(ID)
    
-    line_4 = '@H,timestamp'+''.join(value) + '\n'
-    line_5 = 'ID,'+''.join(ID) + '\n'
-    line_6 = 'Type,Date' + ''.join(double) + '\n'
-    line_7 = 'Format,yyyy-MM-dd HH:mm' + ''.join(commas) + '\n'
+    line_4 = '@H,timestamp' + ''.join(',value_'+i for i in ID)
+    line_5 = 'ID,' + ''.join(','+i for i in ID)
+    line_6 = 'Type,Date' + ',double'*n_ID
+    line_7 = 'Format,yyyy-MM-dd HH:mm' + ','*n_ID
 
     date = datetime.today().strftime('%Y-%m-%d %H:%M')
-    df.insert(loc=0, column='-', value=np.nan)
-    with open(file_name,'w') as file:
-        file.write('@T,table\nCreated,'+ date +'\nAuthor,HortonMachine library\n')
-        file.write(line_4)
-        file.write(line_5)
-        file.write(line_6)
-        file.write(line_7)
-    df.to_csv(file_name, header=False, index=False, mode="a")
+    header = ['@T,table', 'Created,'+ date, 'Author,HortonMachine library', line_4, line_5, line_6, line_7]
+    df.insert(loc=0, column='-', value='')
+    # header and values are written through the same handle. pandas ends the rows
+    # with os.linesep, so the header does the same and newline translation is disabled
+    with open(file_name,'w',newline='') as file:
+        file.write(os.linesep.join(header) + os.linesep)
+        df.to_csv(file, header=False, index=False, na_rep='-9999')
     print ('\n\n***SUCCESS writing!  '+ file_name)
\ No newline at end of file
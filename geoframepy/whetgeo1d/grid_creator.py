@@ -25,9 +25,7 @@ This is used to create the grid for WHETGEO 1D model.
  */
 @author: Niccolo` Tubini, Riccardo Rigon
 """
-import pandas as pd
 import numpy as np
-from scipy.interpolate import interp1d
 
 def grid1D(data_grid, dz_min, b, dz_max, grid_type, **kwargs):
     '''
@@ -137,9 +135,9 @@ def build_grid(data_grid):
     # get the number of control volumes
     KMAX = int(data_grid['K'].sum())-int(len(data_grid[data_grid.Type == 'M']))
     
-    # list containing centroids coordinates
+    # list containing the centroids coordinates of each layer
     tmp_eta = []
-    # list containing control volumes interface coordinates
+    # list containing the control volumes interface coordinates of each layer
     tmp_eta_dual = []
     
     # array containing centroids coordinates measured along eta
@@ -158,59 +156,56 @@ def build_grid(data_grid):
 
 
     
+    # columns of the grid input file as arrays, to avoid a pandas lookup per access
+    layer_type = data_grid['Type'].to_numpy()
+    layer_eta = data_grid['eta'].to_numpy()
+    layer_K = data_grid['K'].to_numpy()
+    
     for i in range(np.size(data_grid.index)-1,0,-1):
 		
-        if data_grid['Type'][i]=='L' and data_grid['Type'][i-1]=='L':
+        if layer_type[i]=='L' and layer_type[i-1]=='L':
 			
-            deta = ( data_grid['eta'][i]-data_grid['eta'][i-1])/data_grid['K'][i-1]
-            tmp_eta=np.append(tmp_eta, np.linspace(data_grid['eta'][i]-deta/2,data_grid['eta'][i-1]+deta/2,num=data_grid['K'][i-1],endpoint=True) )
-            tmp_eta_dual=np.append(tmp_eta_dual, np.linspace(data_grid['eta'][i],data_grid['eta'][i-1],num=data_grid['K'][i-1]+1,endpoint=True) )
+            deta = ( layer_eta[i]-layer_eta[i-1])/layer_K[i-1]
+            tmp_eta.append(np.linspace(layer_eta[i]-deta/2,layer_eta[i-1]+deta/2,num=layer_K[i-1],endpoint=True))
+            tmp_eta_dual.append(np.linspace(layer_eta[i],layer_eta[i-1],num=layer_K[i-1]+1,endpoint=True))
 			
-        elif data_grid['Type'][i]=='L' and data_grid['Type'][i-1]=='M':
+        elif layer_type[i]=='L' and layer_type[i-1]=='M':
 			
-            deta = ( data_grid['eta'][i]-data_grid['eta'][i-1])/data_grid['K'][i-1]
-            tmp_eta=np.append(tmp_eta, np.linspace(data_grid['eta'][i]-deta/2,data_grid['eta'][i-1],num=data_grid['K'][i-1],endpoint=True) )
-            tmp_eta_dual=np.append(tmp_eta_dual, np.linspace(data_grid['eta'][i],data_grid['eta'][i-1]+deta/2,num=data_grid['K'][i-1],endpoint=True) )
+            deta = ( layer_eta[i]-layer_eta[i-1])/layer_K[i-1]
+            tmp_eta.append(np.linspace(layer_eta[i]-deta/2,layer_eta[i-1],num=layer_K[i-1],endpoint=True))
+            tmp_eta_dual.append(np.linspace(layer_eta[i],layer_eta[i-1]+deta/2,num=layer_K[i-1],endpoint=True))
 			
-        elif data_grid['Type'][i]=='M' and data_grid['Type'][i-1]=='L':
+        elif layer_type[i]=='M' and layer_type[i-1]=='L':
 			
-            deta = ( data_grid['eta'][i]-data_grid['eta'][i-1])/data_grid['K'][i-1]
-            tmp_eta=np.append(tmp_eta, np.linspace(data_grid['eta'][i],data_grid['eta'][i-1]+deta/2,num=data_grid['K'][i-1],endpoint=True) )
-            tmp_eta_dual=np.append(tmp_eta_dual, np.linspace(data_grid['eta'][i]-deta/2,data_grid['eta'][i-1],num=data_grid['K'][i-1],endpoint=True) )
+            deta = ( layer_eta[i]-layer_eta[i-1])/layer_K[i-1]
+            tmp_eta.append(np.linspace(layer_eta[i],layer_eta[i-1]+deta/2,num=layer_K[i-1],endpoint=True))
+            tmp_eta_dual.append(np.linspace(layer_eta[i]-deta/2,layer_eta[i-1],num=layer_K[i-1],endpoint=True))
 			
         else:
             print("ERROR!!")  
         
-    # to eliminate doubles
-    tmp_eta=[ii for n,ii in enumerate(tmp_eta) if ii not in tmp_eta[:n]]
-    tmp_eta_dual=[ii for n,ii in enumerate(tmp_eta_dual) if ii not in tmp_eta_dual[:n]]
+    # join the layer segments with a single allocation
+    tmp_eta = np.concatenate(tmp_eta) if tmp_eta else np.array([])
+    tmp_eta_dual = np.concatenate(tmp_eta_dual) if tmp_eta_dual else np.array([])
+
+    # to eliminate doubles, keeping the first occurrence
+    tmp_eta = list(dict.fromkeys(tmp_eta))
+    tmp_eta_dual = list(dict.fromkeys(tmp_eta_dual))
     
    
     # move from list to array
-    for i in range(0,len(tmp_eta)):
-        eta[i] = tmp_eta[i]
-        z[i] = tmp_eta[i] - data_grid['eta'][np.size(data_grid['eta'])-1]
-        
-
-    for i in range(0,len(tmp_eta_dual)):
-
-        eta_dual[i] = tmp_eta_dual[i]
-        z_dual[i] = tmp_eta_dual[i] - data_grid['eta'][np.size(data_grid['eta'])-1]
+    eta[0:len(tmp_eta)] = tmp_eta
+    z[0:len(tmp_eta)] = eta[0:len(tmp_eta)] - layer_eta[-1]
 
-        if i==0:
+    eta_dual[0:len(tmp_eta_dual)] = tmp_eta_dual
+    z_dual[0:len(tmp_eta_dual)] = eta_dual[0:len(tmp_eta_dual)] - layer_eta[-1]
 
-            space_delta[i] = np.abs(eta_dual[i]-eta[i])
-
-        elif i==np.size(eta_dual)-1:
-
-            space_delta[i] = np.abs(eta_dual[i]-eta[i-1])
-
-        else:
-
-            space_delta[i] = np.abs(eta[i-1]-eta[i]) 
+    # at the boundaries the distance is between the centroid and the interface
+    space_delta[0] = np.abs(eta_dual[0]-eta[0])
+    space_delta[1:KMAX] = np.abs(eta[0:KMAX-1]-eta[1:KMAX])
+    space_delta[KMAX] = np.abs(eta_dual[KMAX]-eta[KMAX-1])
            
-    for i in range(0,len(eta_dual)-1):
-        control_volume[i] = np.abs(eta_dual[i]-eta_dual[i+1])		
+    control_volume[:] = np.abs(eta_dual[0:KMAX]-eta_dual[1:KMAX+1])
    
     return [KMAX, eta, eta_dual, space_delta, z, z_dual, control_volume]
 
@@ -267,25 +262,22 @@ def build_grid_exponential(data_grid, dz_min, b):
     k = 0
     while (z_max-dz_sum)>1E-12:
 
-        tmp_dz.append(dz_min*(1+b)**k)
-        dz_sum = dz_sum + dz_min*(1+b)**k
+        dz_k = dz_min*(1+b)**k
+        tmp_dz.append(dz_k)
+        dz_sum = dz_sum + dz_k
 
         if(dz_sum>z_max):
 
-            tmp_dz.pop()
-            dz_sum = dz_sum-dz_min*(1+b)**k
-            tmp_dz.append(z_max-dz_sum)
+            # the last layer is cut to fit the column depth
+            dz_sum = dz_sum-dz_k
+            tmp_dz[-1] = z_max-dz_sum
             dz_sum = dz_sum + z_max-dz_sum
 
         k = k+1
         
     # get the number og control volumes
     KMAX = len(tmp_dz)
-    dz = np.zeros(KMAX,dtype=float)
-    
-    for i in range(0,KMAX):
-
-        dz[i] = tmp_dz[i]
+    dz = np.array(tmp_dz,dtype=float)
     
     # array containing centroids coordinates measured along eta
     eta = np.zeros(KMAX,dtype=float)
@@ -301,34 +293,24 @@ def build_grid_exponential(data_grid, dz_min, b):
     control_volume = np.zeros(KMAX,dtype=float)
 	
 	
-    tmp = 0
-    for i in range(0,KMAX):
-        z[i] = dz[KMAX-1-i]/2+tmp
-        z_dual[i] = tmp
-        tmp = tmp+dz[KMAX-1-i]
-        eta[i] = -z_max + z[i]
-        eta_dual[i] = -z_max + z_dual[i]
+    # layers are stacked from the column bottom: the interfaces are the
+    # cumulative sum of the thicknesses and the centroids lie half a layer above
+    dz_flipped = dz[::-1]
+    z_dual[1:KMAX] = np.cumsum(dz_flipped)[:-1]
+    z[:] = dz_flipped/2 + z_dual[0:KMAX]
+    eta[:] = -z_max + z
+    eta_dual[0:KMAX] = -z_max + z_dual[0:KMAX]
 
     z_dual[KMAX] = z_max
     eta_dual[KMAX] = 0.0       
 
 
-    for i in range(0,KMAX+1):
-
-        if i==0:
+    # at the boundaries the distance is between the centroid and the interface
+    space_delta[0] = np.abs(eta_dual[0]-eta[0])
+    space_delta[1:KMAX] = np.abs(eta[0:KMAX-1]-eta[1:KMAX])
+    space_delta[KMAX] = np.abs(eta_dual[KMAX]-eta[KMAX-1])
 
-            space_delta[i] = np.abs(eta_dual[i]-eta[i])
-
-        elif i==np.size(eta_dual)-1:
-
-            space_delta[i] = np.abs(eta_dual[i]-eta[i-1])
-
-        else:
-
-            space_delta[i] = np.abs(eta[i-1]-eta[i]) 
-
-    for i in range(0,len(eta_dual)-1):
-        control_volume[i] = np.abs(eta_dual[i]-eta_dual[i+1])	
+    control_volume[:] = np.abs(eta_dual[0:KMAX]-eta_dual[1:KMAX+1])
 	
 
     return [KMAX, eta, eta_dual, space_delta, z, z_dual, control_volume]
@@ -384,10 +366,13 @@ def build_grid_mixed(data_grid, dz_min, b, dz_max):
     
     tmp_dz = []
     
-    for layer in range(0,np.size(data_grid['eta'])-1):
+    # coordinates of the grid input file as an array, to avoid a pandas lookup per access
+    layer_eta = data_grid['eta'].to_numpy()
+    
+    for layer in range(0,np.size(layer_eta)-1):
 
-        z_0 = -data_grid['eta'][layer]
-        z_1 = -data_grid['eta'][layer+1]
+        z_0 = -layer_eta[layer]
+        z_1 = -layer_eta[layer+1]
         z_max = z_1-z_0
 
         dz_sum = 0
@@ -395,14 +380,15 @@ def build_grid_mixed(data_grid, dz_min, b, dz_max):
         tmp_layer_dz = []
         
         while (z_max-dz_sum)>1E-12:
-            tmp_layer_dz.append(dz_min*(1+b)**k)
-            dz_sum = dz_sum + dz_min*(1+b)**k
+            dz_k = dz_min*(1+b)**k
+            tmp_layer_dz.append(dz_k)
+            dz_sum = dz_sum + dz_k
 
             if(dz_sum>z_max):
         
-                tmp_layer_dz.pop()
-                dz_sum = dz_sum-dz_min*(1+b)**k
-                tmp_layer_dz.append(z_max-dz_sum)
+                # the last layer is cut to fit the layer depth
+                dz_sum = dz_sum-dz_k
+                tmp_layer_dz[-1] = z_max-dz_sum
                 dz_sum = dz_sum + z_max-dz_sum
 
             k = k+1
@@ -431,10 +417,7 @@ def build_grid_mixed(data_grid, dz_min, b, dz_max):
 
     # get the number og control volumes
     KMAX = len(tmp_dz)
-    dz = np.zeros(KMAX,dtype=float)
-    
-    for i in range(0,KMAX):
-        dz[i] = tmp_dz[i]
+    dz = np.array(tmp_dz,dtype=float)
     
     # array containing centroids coordinates measured along eta
     eta = np.zeros(KMAX,dtype=float)
@@ -449,35 +432,25 @@ def build_grid_mixed(data_grid, dz_min, b, dz_max):
     # array containing control volume size
     control_volume = np.zeros(KMAX,dtype=float)
 	
-    tmp = 0
-    for i in range(0,KMAX):
-        z[i] = dz[KMAX-1-i]/2+tmp
-        z_dual[i] = tmp
-        tmp = tmp+dz[KMAX-1-i]
-        eta[i] = data_grid['eta'][np.size(data_grid['eta'])-1] + z[i]
-        eta_dual[i] = data_grid['eta'][np.size(data_grid['eta'])-1] + z_dual[i]
+    # layers are stacked from the column bottom: the interfaces are the
+    # cumulative sum of the thicknesses and the centroids lie half a layer above
+    dz_flipped = dz[::-1]
+    z_dual[1:KMAX] = np.cumsum(dz_flipped)[:-1]
+    z[:] = dz_flipped/2 + z_dual[0:KMAX]
+    eta[:] = layer_eta[-1] + z
+    eta_dual[0:KMAX] = layer_eta[-1] + z_dual[0:KMAX]
 
 
-    z_dual[KMAX] = -data_grid['eta'][np.size(data_grid['eta'])-1]#z_max
+    z_dual[KMAX] = -layer_eta[-1]#z_max
     eta_dual[KMAX] = 0.0       
 
 
-    for i in range(0,KMAX+1):
-
-        if i==0:
-
-            space_delta[i] = np.abs(eta_dual[i]-eta[i])
-
-        elif i==np.size(eta_dual)-1:
-
-            space_delta[i] = np.abs(eta_dual[i]-eta[i-1])
+    # at the boundaries the distance is between the centroid and the interface
+    space_delta[0] = np.abs(eta_dual[0]-eta[0])
+    space_delta[1:KMAX] = np.abs(eta[0:KMAX-1]-eta[1:KMAX])
+    space_delta[KMAX] = np.abs(eta_dual[KMAX]-eta[KMAX-1])
 
-        else:
-
-            space_delta[i] = np.abs(eta[i-1]-eta[i]) 
-
-    for i in range(0,len(eta_dual)-1):
-        control_volume[i] = np.abs(eta_dual[i]-eta_dual[i+1])	
+    control_volume[:] = np.abs(eta_dual[0:KMAX]-eta_dual[1:KMAX+1])
 	
     return [KMAX, eta, eta_dual, space_delta, z, z_dual, control_volume]
 
@@ -529,6 +502,10 @@ def set_initial_condition(data, eta, psi_interp_model, T_interp_model, **kwargs)
     @author: Niccolò Tubini
     '''
     
+    # scipy.interpolate is needed only here: importing it lazily keeps
+    # the import of the grid tools fast
+    from scipy.interpolate import interp1d
+    
     bound_error = kwargs.get('bounds_error',False)
     fill_value =  kwargs.get('fill_value',np.nan)
     
@@ -620,47 +597,41 @@ def set_parameters_richards(data_grid, data_parameter, data_dictionary, KMAX, et
     equation_state_ID = np.zeros(KMAX, dtype=float)
     parameter_ID = np.zeros(KMAX, dtype=float)
     
-    theta_s = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    theta_r = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_1 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_2 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_3 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_4 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_5 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    alpha_ss = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    beta_ss = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    ks = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    
-    coord_layer = []
-    tmp_equation_state_ID = []
-    tmp_parameter_ID = []
-    
-    for i in data_grid.index:
-
-        if data_grid['Type'][i] == 'L':
-            
-            coord_layer.append(data_grid['eta'][i])
-            tmp_equation_state_ID.append(data_grid['equationStateID'][i])
-            tmp_parameter_ID.append(data_grid['parameterID'][i])
+    # one more entry than the parameter file rows: index 0 is left to zero
+    n_parameter = data_parameter.shape[0]+1
+    theta_s = np.zeros(n_parameter, dtype=float)
+    theta_r = np.zeros(n_parameter, dtype=float)
+    par_1 = np.zeros(n_parameter, dtype=float)
+    par_2 = np.zeros(n_parameter, dtype=float)
+    par_3 = np.zeros(n_parameter, dtype=float)
+    par_4 = np.zeros(n_parameter, dtype=float)
+    par_5 = np.zeros(n_parameter, dtype=float)
+    alpha_ss = np.zeros(n_parameter, dtype=float)
+    beta_ss = np.zeros(n_parameter, dtype=float)
+    ks = np.zeros(n_parameter, dtype=float)
+    
+    # select the layers of the grid input file in a single pass
+    is_layer = data_grid['Type'] == 'L'
+    coord_layer = data_grid['eta'][is_layer].to_numpy()
+    tmp_equation_state_ID = data_grid['equationStateID'][is_layer].to_numpy()
+    tmp_parameter_ID = data_grid['parameterID'][is_layer].to_numpy()
            
      
+    eta_control_volume = np.asarray(eta)[0:KMAX]
     for i in range(np.size(coord_layer)-1,0,-1):
         
-        for j in range(0,KMAX):
-            
-            if(eta[j]>coord_layer[i] and eta[j]<coord_layer[i-1] ):
-                
-                equation_state_ID[j] = tmp_equation_state_ID[i-1]
-                parameter_ID[j] = tmp_parameter_ID[i-1]
+        # control volumes whose centroid lies within the layer
+        in_layer = (eta_control_volume>coord_layer[i]) & (eta_control_volume<coord_layer[i-1])
+        equation_state_ID[in_layer] = tmp_equation_state_ID[i-1]
+        parameter_ID[in_layer] = tmp_parameter_ID[i-1]
         
     parameter_ID[KMAX-1] = parameter_ID[KMAX-2]   
     
     data_parameter.rename(columns=dict(data_dictionary.values), inplace=True)    
 
     columns = ['thetaS', 'thetaR', 'par1', 'par2', 'par3', 'par4', 'par5', 'alphaSpecificStorage', 'betaSpecificStorage', 'Ks']
-    tmp_df = pd.DataFrame(columns=columns)
-    tmp_df = pd.concat([tmp_df, data_parameter],sort=False)
-    tmp_df.replace(np.nan, -9999.0, inplace=True)
+    # parameters missing from the parameter file are set to -9999.0
+    tmp_df = data_parameter.reindex(columns=columns).fillna(-9999.0)
     
     theta_s[1:] = tmp_df['thetaS'].to_numpy()
     theta_r[1:] = tmp_df['thetaR'].to_numpy()
@@ -755,49 +726,43 @@ def set_parameters_heat_diffusion(data_grid, data_parameter, data_dictionary, KM
     equation_state_ID = np.zeros(KMAX, dtype=float)
     parameter_ID = np.zeros(KMAX, dtype=float)
     
-    soil_particles_density = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    thermal_conductivity_soil_particles = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    specific_heat_capacity_soil_particles = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    theta_s = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    theta_r = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    melting_temperature = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_1 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_2 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_3 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_4 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_5 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    alpha_ss = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    beta_ss = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    ks = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    
-    coord_layer = []
-    tmp_equation_state_ID = []
-    tmp_parameter_ID = []
-
-    for i in data_grid.index:
-
-        if data_grid['Type'][i] == 'L':
-            
-            coord_layer.append(data_grid['eta'][i])
-            tmp_equation_state_ID.append(data_grid['equationStateID'][i])
-            tmp_parameter_ID.append(data_grid['parameterID'][i])
+    # one more entry than the parameter file rows: index 0 is left to zero
+    n_parameter = data_parameter.shape[0]+1
+    soil_particles_density = np.zeros(n_parameter, dtype=float)
+    thermal_conductivity_soil_particles = np.zeros(n_parameter, dtype=float)
+    specific_heat_capacity_soil_particles = np.zeros(n_parameter, dtype=float)
+    theta_s = np.zeros(n_parameter, dtype=float)
+    theta_r = np.zeros(n_parameter, dtype=float)
+    melting_temperature = np.zeros(n_parameter, dtype=float)
+    par_1 = np.zeros(n_parameter, dtype=float)
+    par_2 = np.zeros(n_parameter, dtype=float)
+    par_3 = np.zeros(n_parameter, dtype=float)
+    par_4 = np.zeros(n_parameter, dtype=float)
+    par_5 = np.zeros(n_parameter, dtype=float)
+    alpha_ss = np.zeros(n_parameter, dtype=float)
+    beta_ss = np.zeros(n_parameter, dtype=float)
+    ks = np.zeros(n_parameter, dtype=float)
+    
+    # select the layers of the grid input file in a single pass
+    is_layer = data_grid['Type'] == 'L'
+    coord_layer = data_grid['eta'][is_layer].to_numpy()
+    tmp_equation_state_ID = data_grid['equationStateID'][is_layer].to_numpy()
+    tmp_parameter_ID = data_grid['parameterID'][is_layer].to_numpy()
            
      
+    eta_control_volume = np.asarray(eta)[0:KMAX]
     for i in range(np.size(coord_layer)-1,0,-1):
         
-        for j in range(0,KMAX):
-            
-            if(eta[j]>coord_layer[i] and eta[j]<coord_layer[i-1] ):
-                
-                equation_state_ID[j] = tmp_equation_state_ID[i-1]
-                parameter_ID[j] = tmp_parameter_ID[i-1]
+        # control volumes whose centroid lies within the layer
+        in_layer = (eta_control_volume>coord_layer[i]) & (eta_control_volume<coord_layer[i-1])
+        equation_state_ID[in_layer] = tmp_equation_state_ID[i-1]
+        parameter_ID[in_layer] = tmp_parameter_ID[i-1]
         
     data_parameter.rename(columns=dict(data_dictionary.values), inplace=True)   
     
     columns = ['spDensity', 'spConductivity', 'spSpecificHeatCapacity', 'thetaS', 'thetaR', 'par1', 'par2', 'par3', 'par4', 'par5', 'alphaSpecificStorage', 'betaSpecificStorage', 'Ks']
-    tmp_df = pd.DataFrame(columns=columns)
-    tmp_df = pd.concat([tmp_df, data_parameter],sort=False)
-    tmp_df.replace(np.nan, -9999.0, inplace=True)
+    # parameters missing from the parameter file are set to -9999.0
+    tmp_df = data_parameter.reindex(columns=columns).fillna(-9999.0)
     
     soil_particles_density[1:] = tmp_df['spDensity'].to_numpy()
     thermal_conductivity_soil_particles[1:] = tmp_df['spConductivity'].to_numpy()
@@ -891,41 +856,36 @@ def set_parameters_richards_heat_advection_diffusion(data_grid, data_parameter,
     equation_state_ID = np.zeros(KMAX, dtype=float)
     parameter_ID = np.zeros(KMAX, dtype=float)
     
-    soil_particles_density = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    thermal_conductivity_soil_particles = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    specific_heat_capacity_soil_particles = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    theta_s = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    theta_r = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_1 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_2 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_3 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_4 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    par_5 = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    alpha_ss = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    beta_ss = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    ks = np.zeros(data_parameter.shape[0]+1, dtype=float)
-    
-    coord_layer = []
-    tmp_equation_state_ID = []
-    tmp_parameter_ID = []
-    
-    for i in data_grid.index:
-
-        if data_grid['Type'][i] == 'L':
-            
-            coord_layer.append(data_grid['eta'][i])
-            tmp_equation_state_ID.append(data_grid['equationStateID'][i])
-            tmp_parameter_ID.append(data_grid['parameterID'][i])
+    # one more entry than the parameter file rows: index 0 is left to zero
+    n_parameter = data_parameter.shape[0]+1
+    soil_particles_density = np.zeros(n_parameter, dtype=float)
+    thermal_conductivity_soil_particles = np.zeros(n_parameter, dtype=float)
+    specific_heat_capacity_soil_particles = np.zeros(n_parameter, dtype=float)
+    theta_s = np.zeros(n_parameter, dtype=float)
+    theta_r = np.zeros(n_parameter, dtype=float)
+    par_1 = np.zeros(n_parameter, dtype=float)
+    par_2 = np.zeros(n_parameter, dtype=float)
+    par_3 = np.zeros(n_parameter, dtype=float)
+    par_4 = np.zeros(n_parameter, dtype=float)
+    par_5 = np.zeros(n_parameter, dtype=float)
+    alpha_ss = np.zeros(n_parameter, dtype=float)
+    beta_ss = np.zeros(n_parameter, dtype=float)
+    ks = np.zeros(n_parameter, dtype=float)
+    
+    # select the layers of the grid input file in a single pass
+    is_layer = data_grid['Type'] == 'L'
+    coord_layer = data_grid['eta'][is_layer].to_numpy()
+    tmp_equation_state_ID = data_grid['equationStateID'][is_layer].to_numpy()
+    tmp_parameter_ID = data_grid['parameterID'][is_layer].to_numpy()
            
      
+    eta_control_volume = np.asarray(eta)[0:KMAX]
     for i in range(np.size(coord_layer)-1,0,-1):
         
-        for j in range(0,KMAX):
-            
-            if(eta[j]>coord_layer[i] and eta[j]<coord_layer[i-1] ):
-                
-                equation_state_ID[j] = tmp_equation_state_ID[i-1]
-                parameter_ID[j] = tmp_parameter_ID[i-1]
+        # control volumes whose centroid lies within the layer
+        in_layer = (eta_control_volume>coord_layer[i]) & (eta_control_volume<coord_layer[i-1])
+        equation_state_ID[in_layer] = tmp_equation_state_ID[i-1]
+        parameter_ID[in_layer] = tmp_parameter_ID[i-1]
         
     parameter_ID[KMAX-1] = parameter_ID[KMAX-2]   
     
@@ -933,9 +893,8 @@ def set_parameters_richards_heat_advection_diffusion(data_grid, data_parameter,
 
     columns = ['spDensity', 'spConductivity', 'spSpecificHeatCapacity', 'thetaS', 'thetaR', 'par1', 'par2', 'par3', 'par4', 'par5', 'alphaSpecificStorage', 'betaSpecificStorage', 'Ks']
 
-    tmp_df = pd.DataFrame(columns=columns)
-    tmp_df = pd.concat([tmp_df, data_parameter],sort=False)
-    tmp_df.replace(np.nan, -9999.0, inplace=True)
+    # parameters missing from the parameter file are set to -9999.0
+    tmp_df = data_parameter.reindex(columns=columns).fillna(-9999.0)
     
     soil_particles_density[1:] = tmp_df['spDensity'].to_numpy()
     thermal_conductivity_soil_particles[1:] = tmp_df['spConductivity'].to_numpy()
@@ -974,13 +933,14 @@ def calibration_point_index(data_grid, eta):
     @author: Niccolò Tubini
     '''
     
-    measurament_eta = []
-    for i in np.where(data_grid['Type']=='M'):
-        measurament_eta = np.append(measurament_eta, data_grid['eta'][i])
+    measurament_eta = data_grid['eta'][data_grid['Type']=='M']
+    
+    # map each centroid coordinate to its indices, scanning eta only once
+    eta_index = {}
+    for k, value in enumerate(eta):
+        eta_index.setdefault(value, []).append(k)
     
-    control_volume_index = []
-    for i in measurament_eta:
-        control_volume_index = np.append(control_volume_index, np.where(eta==i))
+    control_volume_index = np.array([k for i in measurament_eta for k in eta_index.get(i, [])], dtype=float)
 
     return control_volume_index
 
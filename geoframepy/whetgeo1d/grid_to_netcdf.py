@@ -27,7 +27,6 @@ This is used to create the grid for WHETGEO 1D model.
 @author: Niccolo` Tubini, Riccardo Rigon
 @license: creative commons 4.0
 """
-import pandas as pd
 import numpy as np
 from netCDF4 import Dataset
 
@@ -249,41 +248,35 @@ def write_grid_netCDF_richards(eta, eta_dual, z, z_dual, space_delta, control_vo
 
     data_KMAX[0] = KMAX
 
-    for i in range(0,dim):
-        data_eta[i] = eta[i]
-        data_z[i] = z[i]
-        data_control_volume[i] = control_volume[i]
-        data_psi_0[i] = psi_0[i]
-        data_T_0[i] = T_0[i]
-        data_equation_state_ID[i] = equation_state_ID[i]
-        data_parameter_ID[i] = parameter_ID[i]
-    
-    for i in range(0,dim1):
-        data_eta_dual[i] = eta_dual[i]
-        data_z_dual[i] = z_dual[i]
-        data_space_delta[i] = space_delta[i]
+    # each variable is written with a single call instead of element by element
+    data_eta[:] = eta
+    data_z[:] = z
+    data_control_volume[:] = control_volume
+    data_psi_0[:] = psi_0
+    data_T_0[:] = T_0
+    data_equation_state_ID[:] = equation_state_ID
+    data_parameter_ID[:] = parameter_ID
+    
+    data_eta_dual[:] = eta_dual
+    data_z_dual[:] = z_dual
+    data_space_delta[:] = space_delta
         
-    for i in range(0,dim2):
-        data_space_delta[i] = space_delta[i]
-        
-    for i in range(0,dim_parameter):
-        data_theta_s[i] = theta_s[i]
-        data_theta_r[i] = theta_r[i]
-        data_par_1[i] = par_1[i]
-        data_par_2[i] = par_2[i]
-        data_par_3[i] = par_3[i]
-        data_par_4[i] = par_4[i]
-        data_par_5[i] = par_5[i]
-        data_alpha_ss[i] = alpha_ss[i]
-        data_beta_ss[i] = beta_ss[i]
-        data_ks[i] = ks[i]
+    data_theta_s[:] = theta_s
+    data_theta_r[:] = theta_r
+    data_par_1[:] = par_1
+    data_par_2[:] = par_2
+    data_par_3[:] = par_3
+    data_par_4[:] = par_4
+    data_par_5[:] = par_5
+    data_alpha_ss[:] = alpha_ss
+    data_beta_ss[:] = beta_ss
+    data_ks[:] = ks
         
 #     if not control_volume_index:
     if control_volume_index is None:
         data_control_volume_index = -9999
     else:
-        for i in range(0,len(control_volume_index)):
-            data_control_volume_index[i] = control_volume_index[i]
+        data_control_volume_index[0:len(control_volume_index)] = control_volume_index
     
     ## close the file.
     ncfile.close()
@@ -543,35 +536,33 @@ def write_grid_netCDF_heat_diffusion(eta, eta_dual, z, z_dual, space_delta, cont
 
     data_KMAX[0] = KMAX
 
-    for i in range(0,dim):
-        data_eta[i] = eta[i]
-        data_z[i] = z[i]
-        data_control_volume[i] = control_volume[i]
-        data_psi_0[i] = psi_0[i]
-        data_T_0[i] = T_0[i]
-        data_equation_state_ID[i] = equation_state_ID[i]
-        data_parameter_ID[i] = parameter_ID[i]
+    # each variable is written with a single call instead of element by element
+    data_eta[:] = eta
+    data_z[:] = z
+    data_control_volume[:] = control_volume
+    data_psi_0[:] = psi_0
+    data_T_0[:] = T_0
+    data_equation_state_ID[:] = equation_state_ID
+    data_parameter_ID[:] = parameter_ID
     	
-    for i in range(0,dim1):
-        data_eta_dual[i] = eta_dual[i]
-        data_z_dual[i] = z_dual[i]
-        data_space_delta[i] = space_delta[i]
+    data_eta_dual[:] = eta_dual
+    data_z_dual[:] = z_dual
+    data_space_delta[0:dim1] = space_delta[0:dim1]
     	
-    for i in range(0,dim_parameter):
-        data_soil_particles_density[i] = soil_particles_density[i]
-        data_thermal_conductivity_soil_particles[i] = thermal_conductivity_soil_particles[i]
-        data_specific_heat_capacity_soil_particles[i] = specific_heat_capacity_soil_particles[i]
-        data_theta_s[i] = theta_s[i]
-        data_theta_r[i] = theta_r[i]
-        data_melting_temperature[i] = melting_temperature[i]
-        data_par_1[i] = par_1[i]
-        data_par_2[i] = par_2[i]
-        data_par_3[i] = par_3[i]
-        data_par_4[i] = par_4[i]
-        data_par_5[i] = par_5[i]
-        data_alpha_ss[i] = alpha_ss[i]
-        data_beta_ss[i] = beta_ss[i]
-        data_ks[i] = ks[i]
+    data_soil_particles_density[:] = soil_particles_density
+    data_thermal_conductivity_soil_particles[:] = thermal_conductivity_soil_particles
+    data_specific_heat_capacity_soil_particles[:] = specific_heat_capacity_soil_particles
+    data_theta_s[:] = theta_s
+    data_theta_r[:] = theta_r
+    data_melting_temperature[:] = melting_temperature
+    data_par_1[:] = par_1
+    data_par_2[:] = par_2
+    data_par_3[:] = par_3
+    data_par_4[:] = par_4
+    data_par_5[:] = par_5
+    data_alpha_ss[:] = alpha_ss
+    data_beta_ss[:] = beta_ss
+    data_ks[:] = ks
         
     print(par_1)
     ## close the file.
@@ -826,45 +817,39 @@ specific_heat_capacity_soil_particles,theta_s, theta_r, par_1, par_2, par_3, par
 
     data_KMAX[0] = KMAX
 
-    for i in range(0,dim):
-        data_eta[i] = eta[i]
-        data_z[i] = z[i]
-        data_control_volume[i] = control_volume[i]
-        data_psi_0[i] = psi_0[i]
-        data_T_0[i] = T_0[i]
-        data_equation_state_ID[i] = equation_state_ID[i]
-        data_parameter_ID[i] = parameter_ID[i]
-    
-    for i in range(0,dim1):
-        data_eta_dual[i] = eta_dual[i]
-        data_z_dual[i] = z_dual[i]
-        data_space_delta[i] = space_delta[i]
-        
-    for i in range(0,dim2):
-        data_space_delta[i] = space_delta[i]
+    # each variable is written with a single call instead of element by element
+    data_eta[:] = eta
+    data_z[:] = z
+    data_control_volume[:] = control_volume
+    data_psi_0[:] = psi_0
+    data_T_0[:] = T_0
+    data_equation_state_ID[:] = equation_state_ID
+    data_parameter_ID[:] = parameter_ID
+    
+    data_eta_dual[:] = eta_dual
+    data_z_dual[:] = z_dual
+    data_space_delta[:] = space_delta
         
-    for i in range(0,dim_parameter):
-        data_soil_particles_density[i] = soil_particles_density[i]
-        data_thermal_conductivity_soil_particles[i] = thermal_conductivity_soil_particles[i]
-        data_specific_heat_capacity_soil_particles[i] = specific_heat_capacity_soil_particles[i]
-        data_theta_s[i] = theta_s[i]
-        data_theta_r[i] = theta_r[i]
-        data_melting_temperature[i] = -9999.0
-        data_par_1[i] = par_1[i]
-        data_par_2[i] = par_2[i]
-        data_par_3[i] = par_3[i]
-        data_par_4[i] = par_4[i]
-        data_par_5[i] = par_5[i]
-        data_alpha_ss[i] = alpha_ss[i]
-        data_beta_ss[i] = beta_ss[i]
-        data_ks[i] = ks[i]
+    data_soil_particles_density[:] = soil_particles_density
+    data_thermal_conductivity_soil_particles[:] = thermal_conductivity_soil_particles
+    data_specific_heat_capacity_soil_particles[:] = specific_heat_capacity_soil_particles
+    data_theta_s[:] = theta_s
+    data_theta_r[:] = theta_r
+    data_melting_temperature[:] = -9999.0
+    data_par_1[:] = par_1
+    data_par_2[:] = par_2
+    data_par_3[:] = par_3
+    data_par_4[:] = par_4
+    data_par_5[:] = par_5
+    data_alpha_ss[:] = alpha_ss
+    data_beta_ss[:] = beta_ss
+    data_ks[:] = ks
         
 #     if not control_volume_index:
     if control_volume_index is None:
         data_control_volume_index = -9999
     else:
-        for i in range(0,len(control_volume_index)):
-            data_control_volume_index[i] = control_volume_index[i]
+        data_control_volume_index[0:len(control_volume_index)] = control_volume_index
     
     ## close the file.
     ncfile.close()